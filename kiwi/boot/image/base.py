@@ -42,6 +42,12 @@ class BootImageBase:
     :param string root_dir: system image root directory
     :param list signing_keys: list of package signing keys
     """
+    __slots__ = (
+        'xml_state', 'target_dir', 'initrd_filename', 'boot_xml_state',
+        'setup', 'temp_directories', 'call_destructor', 'signing_keys',
+        'boot_root_directory', 'initrd_base_name'
+    )
+
     def __init__(
         self, xml_state, target_dir, root_dir=None, signing_keys=None
     ):
@@ -39,6 +39,8 @@ class BootImageKiwi(BootImageBase):
     to control the first boot an appliance. The kiwi initrd replaces
     itself after first boot by the result of dracut.
     """
+    __slots__ = ()
+
     def post_init(self):
         """
         Post initialization method
@@ -17,6 +17,8 @@
 #
 import os
 import re
+import mmap
+import shutil
 from collections import namedtuple
 
 # project
@@ -25,23 +27,49 @@ from kiwi.command import Command
 from kiwi.system.kernel import Kernel
 from kiwi.boot.image.base import BootImageBase
 from kiwi.defaults import Defaults
+from kiwi.runtime_config import RuntimeConfig
 from kiwi.system.profile import Profile
 from kiwi.system.setup import SystemSetup
 from kiwi.path import Path
+from kiwi.utils.sysconfig import SysConfig
+from kiwi.utils.command_capabilities import CommandCapabilities
 
 from kiwi.exceptions import KiwiDiskBootImageError
 
+dracut_outfile_expression = re.compile(rb'outfile="/boot/(init.*\$kernel.*)"')
+
+# dracut output file format per os-release ID
+dracut_outfile_format_by_distribution = {
+    'suse': 'initrd-{kernel_version}',
+    'rhel': 'initramfs-{kernel_version}.img',
+    'fedora': 'initramfs-{kernel_version}.img',
+    'debian': 'initrd.img-{kernel_version}'
+}
+
 
 class BootImageDracut(BootImageBase):
     """
     **Implements creation of dracut boot(initrd) images.**
     """
+    __slots__ = (
+        'compression', 'xz_threads_support', 'kernel_details',
+        'dracut_options', 'included_files', 'included_files_install',
+        'modules', 'install_modules', 'omit_modules', 'omit_install_modules'
+    )
+
+    # dracut output file format per boot root directory
+    _outfile_format_cache = {}
+
     def post_init(self):
         """
         Post initialization method
 
-        Initialize empty list of dracut caller options
+        Initialize empty list of dracut caller options and
+        lookup the initrd compression from the runtime config
         """
+        self.compression = RuntimeConfig().get_initrd_compression()
+        self.xz_threads_support = None
+        self.kernel_details = None
         self.dracut_options = []
         self.included_files = []
         self.included_files_install = []
@@ -121,6 +149,7 @@ class BootImageDracut(BootImageBase):
         * Create kiwi .profile environment to be included in dracut initrd
         * Setup machine_id(s) to be generic and rebuild by dracut on boot
         """
+        self.kernel_details = None
         profile = Profile(self.xml_state)
         defaults = Defaults()
         defaults.to_profile(profile)
@@ -143,59 +172,130 @@ class BootImageDracut(BootImageBase):
         """
         if self.is_prepared():
             log.info('Creating generic dracut initrd archive')
-            kernel_info = Kernel(self.boot_root_directory)
-            kernel_details = kernel_info.get_kernel(raise_on_not_found=True)
+            kernel_details = self._get_kernel_details(raise_on_not_found=True)
             if basename:
                 dracut_initrd_basename = basename
             else:
                 dracut_initrd_basename = self.initrd_base_name
             if install_initrd:
                 included_files = self.included_files_install
-                modules_args = [
-                    '--add', ' {0} '.format(' '.join(self.install_modules))
-                ] if self.install_modules else []
-                omit_modules_args = [
-                    '--omit', ' {0} '.format(
-                        ' '.join(self.omit_install_modules)
-                    )
-                ] if self.omit_install_modules else []
+                modules = self.install_modules
+                omit_modules = self.omit_install_modules
             else:
                 included_files = self.included_files
-                modules_args = [
-                    '--add', ' {0} '.format(' '.join(self.modules))
-                ] if self.modules else []
-                omit_modules_args = [
-                    '--omit', ' {0} '.format(' '.join(self.omit_modules))
-                ] if self.omit_modules else []
-            dracut_initrd_basename += '.xz'
-            options = self.dracut_options + modules_args +\
-                omit_modules_args + included_files
+                modules = self.modules
+                omit_modules = self.omit_modules
+            modules_args = []
+            for module in modules:
+                modules_args.extend(['--add', module])
+            omit_modules_args = []
+            for module in omit_modules:
+                omit_modules_args.extend(['--omit', module])
+            # the install media initrd is always xz compressed, the
+            # install builders provide it as pxeboot.initrd.xz
+            compression = 'xz' if install_initrd else self.compression
+            compress_on_host = False
+            if compression == 'zstd':
+                compress_options = ['--zstd']
+                dracut_initrd_basename += '.zst'
+            elif compression == 'reflink' and \
+                    self._has_reflink_support():
+                compress_options = ['--enhanced-cpio', '--no-compress']
+            elif self._has_xz_threads_support():
+                compress_options = [
+                    '--compress',
+                    'xz --check=crc32 --lzma2=dict=1MiB --threads=0'
+                ]
+                dracut_initrd_basename += '.xz'
+            else:
+                # the xz in the boot root can't compress in parallel.
+                # Let dracut create an uncompressed archive and
+                # compress it with the xz from the build host
+                compress_options = ['--no-compress']
+                compress_on_host = True
             dracut_call = Command.run(
                 [
                     'chroot', self.boot_root_directory,
                     'dracut', '--force',
                     '--no-hostonly',
                     '--no-hostonly-cmdline',
-                    '--xz'
-                ] + options + [
+                    *compress_options,
+                    *self.dracut_options,
+                    *modules_args,
+                    *omit_modules_args,
+                    *included_files,
                     dracut_initrd_basename,
                     kernel_details.version
                 ],
                 stderr_to_stdout=True
             )
             log.debug(dracut_call.output)
-            Command.run(
-                [
-                    'mv',
-                    os.sep.join(
-                        [self.boot_root_directory, dracut_initrd_basename]
-                    ),
-                    self.target_dir
-                ]
+            dracut_initrd = os.sep.join(
+                [self.boot_root_directory, dracut_initrd_basename]
             )
-            self.initrd_filename = os.sep.join(
-                [self.target_dir, dracut_initrd_basename]
+            if compress_on_host:
+                # stream the uncompressed archive from the boot root
+                # into the compressed initrd in the target directory
+                log.info('--> xz compressing archive')
+                self.initrd_filename = os.sep.join(
+                    [self.target_dir, dracut_initrd_basename + '.xz']
+                )
+                bash_command = [
+                    'xz', '--check=crc32', '--lzma2=dict=1MiB',
+                    '--threads=0', '--stdout', dracut_initrd,
+                    '>', self.initrd_filename
+                ]
+                Command.run(['bash', '-c', ' '.join(bash_command)])
+                os.remove(dracut_initrd)
+            else:
+                self.initrd_filename = os.sep.join(
+                    [self.target_dir, dracut_initrd_basename]
+                )
+                shutil.move(dracut_initrd, self.initrd_filename)
+
+    def _has_reflink_support(self):
+        """
+        Check if the filesystem of the boot root directory supports
+        reflinks. Only then dracut's enhanced cpio mode is able to
+        share the uncompressed initrd data with the boot root files
+        """
+        filesystem = Command.run(
+            [
+                'stat', '--file-system', '--format', '%T',
+                self.boot_root_directory
+            ], raise_on_error=False
+        ).output
+        if filesystem and filesystem.strip() in ('btrfs', 'xfs'):
+            return True
+        log.warning('Filesystem of {0} does not support reflinks'.format(
+            self.boot_root_directory
+        ))
+        log.warning('Using xz compression for the initrd')
+        return False
+
+    def _get_kernel_details(self, raise_on_not_found=False):
+        """
+        Lookup the kernel of the boot root directory. The result is
+        kept until the next call of prepare
+        """
+        if not self.kernel_details:
+            self.kernel_details = Kernel(
+                self.boot_root_directory
+            ).get_kernel(raise_on_not_found=raise_on_not_found)
+        return self.kernel_details
+
+    def _has_xz_threads_support(self):
+        """
+        Check if the xz compressor in the boot root directory is able
+        to compress in parallel. The result is looked up once per
+        instance
+        """
+        if self.xz_threads_support is None:
+            self.xz_threads_support = CommandCapabilities.has_option_in_help(
+                'xz', '--threads', root=self.boot_root_directory,
+                raise_on_error=False
             )
+        return self.xz_threads_support
 
     def get_boot_names(self):
         """
@@ -216,10 +316,7 @@ class BootImageDracut(BootImageBase):
         boot_names_type = namedtuple(
             'boot_names_type', ['kernel_name', 'initrd_name']
         )
-        kernel = Kernel(
-            self.boot_root_directory
-        )
-        kernel_info = kernel.get_kernel()
+        kernel_info = self._get_kernel_details()
         if not kernel_info:
             raise KiwiDiskBootImageError(
                 'No kernel in boot image tree %s found' %
@@ -243,21 +340,75 @@ class BootImageDracut(BootImageBase):
         distribution does
         """
         default_outfile_format = 'initramfs-{kernel_version}.img'
-        dracut_search_env = {
-            'PATH': os.sep.join([self.boot_root_directory, 'usr', 'bin'])
-        }
-        dracut_tool = Path.which(
-            'dracut', custom_env=dracut_search_env, access_mode=os.X_OK
+        cached_format = self._outfile_format_cache.get(
+            self.boot_root_directory
         )
-        if dracut_tool:
-            outfile_expression = r'outfile="/boot/(init.*\$kernel.*)"'
-            with open(dracut_tool) as dracut:
-                outfile = re.findall(outfile_expression, dracut.read())[0]
-                if outfile:
-                    return outfile.replace('$kernel', '{kernel_version}')
+        if cached_format:
+            return cached_format
+        # a derivative distribution may name its initrd differently
+        # than the distribution it is like. Thus the dracut script of
+        # the boot root is preferred over a match of the ID_LIKE entries
+        outfile_format = self._get_distribution_outfile_format('ID') or \
+            self._get_dracut_script_outfile_format() or \
+            self._get_distribution_outfile_format('ID_LIKE')
+        if outfile_format:
+            self._outfile_format_cache[
+                self.boot_root_directory
+            ] = outfile_format
+            return outfile_format
 
         log.warning('Could not detect dracut output file format')
         log.warning('Using default initrd file name format {0}'.format(
             default_outfile_format
         ))
         return default_outfile_format
+
+    def _get_distribution_outfile_format(self, os_release_key):
+        """
+        Lookup the dracut output file format for the distribution
+        IDs listed in the given os-release key of the boot root
+        directory
+
+        :param str os_release_key: ID or ID_LIKE
+        """
+        for os_release in ['etc/os-release', 'usr/lib/os-release']:
+            os_release_file = os.sep.join(
+                [self.boot_root_directory, os_release]
+            )
+            if os.path.exists(os_release_file):
+                distribution_ids = SysConfig(os_release_file).get(
+                    os_release_key
+                ) or ''
+                for distribution_id in distribution_ids.strip('"\'').split():
+                    if distribution_id in dracut_outfile_format_by_distribution:
+                        return dracut_outfile_format_by_distribution[
+                            distribution_id
+                        ]
+                return None
+
+    def _get_dracut_script_outfile_format(self):
+        """
+        Lookup the dracut output file format from the outfile
+        definition in the dracut script of the boot root directory
+        """
+        dracut_search_env = {
+            'PATH': os.sep.join([self.boot_root_directory, 'usr', 'bin'])
+        }
+        dracut_tool = Path.which(
+            'dracut', custom_env=dracut_search_env, access_mode=os.X_OK
+        )
+        outfile = None
+        if dracut_tool:
+            with open(dracut_tool, 'rb') as dracut:
+                # an empty file can't be mapped
+                if os.fstat(dracut.fileno()).st_size:
+                    with mmap.mmap(
+                        dracut.fileno(), 0, access=mmap.ACCESS_READ
+                    ) as dracut_data:
+                        outfile = dracut_outfile_expression.search(
+                            dracut_data
+                        )
+            if outfile:
+                return outfile.group(1).decode().replace(
+                    '$kernel', '{kernel_version}'
+                )
@@ -1310,6 +1310,17 @@ class Defaults:
         """
         return 'xz'
 
+    @staticmethod
+    def get_initrd_compression():
+        """
+        Provides default initrd compression algorithm
+
+        :return: name
+
+        :rtype: str
+        """
+        return 'xz'
+
     @staticmethod
     def get_default_container_name():
         """
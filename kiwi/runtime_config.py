@@ -172,6 +172,41 @@ class RuntimeConfig:
             )
             return Defaults.get_container_compression()
 
+    def get_initrd_compression(self):
+        """
+        Return compression algorithm to use for compression of
+        dracut initrd images
+
+        initrd:
+          - compress: xz|zstd|reflink
+
+        The reflink setting creates an uncompressed initrd using
+        dracut's enhanced cpio mode, which allows to reflink the
+        initrd content on filesystems supporting it. On other
+        filesystems xz compression is used.
+
+        if no or invalid configuration data is provided, the default
+        compression algorithm from the Defaults class is returned
+
+        :return: A name
+
+        :rtype: str
+        """
+        initrd_compression = self._get_attribute(
+            element='initrd', attribute='compress'
+        )
+        if not initrd_compression:
+            return Defaults.get_initrd_compression()
+        elif initrd_compression in ('xz', 'zstd', 'reflink'):
+            return initrd_compression
+        else:
+            log.warning(
+                'Skipping invalid initrd compression: {0}'.format(
+                    initrd_compression
+                )
+            )
+            return Defaults.get_initrd_compression()
+
     def get_iso_tool_category(self):
         """
         Return tool category which should be used to build iso images
@@ -15,13 +15,100 @@
 # You should have received a copy of the GNU General Public License
 # along with kiwi.  If not, see <http://www.gnu.org/licenses/>
 #
-import collections
-from tempfile import NamedTemporaryFile
-
 # project
 from kiwi.system.shell import Shell
 from kiwi.defaults import Defaults
 
+# profile key to oemconfig section getter
+oemconfig_profile_map = (
+    ('kiwi_oemvmcp_parmfile', 'get_oem_vmcp_parmfile'),
+    ('kiwi_oemmultipath_scan', 'get_oem_multipath_scan'),
+    ('kiwi_oemswapMB', 'get_oem_swapsize'),
+    ('kiwi_oemrootMB', 'get_oem_systemsize'),
+    ('kiwi_oemswap', 'get_oem_swap'),
+    ('kiwi_oempartition_install', 'get_oem_partition_install'),
+    ('kiwi_oemdevicefilter', 'get_oem_device_filter'),
+    ('kiwi_oemtitle', 'get_oem_boot_title'),
+    ('kiwi_oemkboot', 'get_oem_kiwi_initrd'),
+    ('kiwi_oemnicfilter', 'get_oem_nic_filter'),
+    ('kiwi_oemreboot', 'get_oem_reboot'),
+    ('kiwi_oemrebootinteractive', 'get_oem_reboot_interactive'),
+    ('kiwi_oemshutdown', 'get_oem_shutdown'),
+    ('kiwi_oemshutdowninteractive', 'get_oem_shutdown_interactive'),
+    ('kiwi_oemsilentboot', 'get_oem_silent_boot'),
+    ('kiwi_oemsilentinstall', 'get_oem_silent_install'),
+    ('kiwi_oemsilentverify', 'get_oem_silent_verify'),
+    ('kiwi_oemskipverify', 'get_oem_skip_verify'),
+    ('kiwi_oembootwait', 'get_oem_bootwait'),
+    ('kiwi_oemunattended', 'get_oem_unattended'),
+    ('kiwi_oemunattended_id', 'get_oem_unattended_id'),
+    ('kiwi_oemrecovery', 'get_oem_recovery'),
+    ('kiwi_oemrecoveryID', 'get_oem_recoveryID'),
+    ('kiwi_oemrecoveryPartSize', 'get_oem_recovery_part_size'),
+    ('kiwi_oemrecoveryInPlace', 'get_oem_inplace_recovery')
+)
+
+# profile key to build type section getter
+type_profile_map = (
+    ('kiwi_type', 'get_image'),
+    ('kiwi_compressed', 'get_compressed'),
+    ('kiwi_boot_timeout', 'get_boottimeout'),
+    ('kiwi_wwid_wait_timeout', 'get_wwid_wait_timeout'),
+    ('kiwi_hybridpersistent', 'get_hybridpersistent'),
+    ('kiwi_hybridpersistent_filesystem', 'get_hybridpersistent_filesystem'),
+    ('kiwi_ramonly', 'get_ramonly'),
+    ('kiwi_target_blocksize', 'get_target_blocksize'),
+    ('kiwi_target_removable', 'get_target_removable'),
+    ('kiwi_cmdline', 'get_kernelcmdline'),
+    ('kiwi_firmware', 'get_firmware'),
+    ('kiwi_bootloader', 'get_bootloader'),
+    ('kiwi_bootloader_console', 'get_bootloader_console'),
+    ('kiwi_btrfs_root_is_snapshot', 'get_btrfs_root_is_snapshot'),
+    ('kiwi_gpt_hybrid_mbr', 'get_gpt_hybrid_mbr'),
+    ('kiwi_devicepersistency', 'get_devicepersistency'),
+    ('kiwi_installboot', 'get_installboot'),
+    ('kiwi_bootkernel', 'get_bootkernel'),
+    ('kiwi_fsmountoptions', 'get_fsmountoptions'),
+    ('kiwi_bootprofile', 'get_bootprofile'),
+    ('kiwi_vga', 'get_vga')
+)
+
+# profile key to preferences section getter
+preferences_profile_map = (
+    ('kiwi_iversion', 'get_version'),
+    ('kiwi_showlicense', 'get_showlicense'),
+    ('kiwi_keytable', 'get_keytable'),
+    ('kiwi_timezone', 'get_timezone'),
+    ('kiwi_language', 'get_locale'),
+    ('kiwi_splash_theme', 'get_bootsplash_theme'),
+    ('kiwi_loader_theme', 'get_bootloader_theme')
+)
+
+
+def _text(section_content):
+    """
+    Helper function to return the text for XML elements of the
+    following structure: <section>text</section>. The data
+    structure builder will return the text as a list
+    """
+    if section_content:
+        content = section_content[0]
+        if content is True:
+            return 'true'
+        else:
+            return content
+
+
+def _format(value):
+    """
+    Helper function to format bool profile values in the way
+    the boot code expects them
+    """
+    if value is True:
+        return 'true'
+    else:
+        return format(value)
+
 
 class Profile:
     """
@@ -33,6 +120,8 @@ class Profile:
     :param object xml_state: instance of :class`XMLState`
     :param dict dot_profile: profile dictionary
     """
+    __slots__ = ('xml_state', 'dot_profile')
+
     def __init__(self, xml_state):
         self.xml_state = xml_state
         self.dot_profile = {}
@@ -69,17 +158,13 @@ class Profile:
 
         :rtype: str
         """
-        sorted_profile = collections.OrderedDict(
-            sorted(self.dot_profile.items())
+        profile_data = ''.join(
+            [
+                format(key) + '=' + _format(value) + '\n'
+                for key, value in sorted(self.dot_profile.items()) if value
+            ]
         )
-        temp_profile = NamedTemporaryFile()
-        with open(temp_profile.name, 'w') as profile:
-            for key, value in list(sorted_profile.items()):
-                if value:
-                    profile.write(
-                        format(key) + '=' + self._format(value) + '\n'
-                    )
-        return Shell.quote_key_value_file(temp_profile.name)
+        return Shell.quote_key_value_string(profile_data)
 
     def _oemconfig_to_profile(self):
         # kiwi_oemvmcp_parmfile
@@ -109,62 +194,15 @@ class Profile:
         # kiwi_oemrecoveryInPlace
         oemconfig = self.xml_state.get_build_type_oemconfig_section()
         if oemconfig:
-            self.dot_profile['kiwi_oemvmcp_parmfile'] = \
-                self._text(oemconfig.get_oem_vmcp_parmfile())
-            self.dot_profile['kiwi_oemmultipath_scan'] = \
-                self._text(oemconfig.get_oem_multipath_scan())
-            self.dot_profile['kiwi_oemswapMB'] = \
-                self._text(oemconfig.get_oem_swapsize())
-            self.dot_profile['kiwi_oemrootMB'] = \
-                self._text(oemconfig.get_oem_systemsize())
-            self.dot_profile['kiwi_oemswap'] = \
-                self._text(oemconfig.get_oem_swap())
-            self.dot_profile['kiwi_oempartition_install'] = \
-                self._text(oemconfig.get_oem_partition_install())
-            self.dot_profile['kiwi_oemdevicefilter'] = \
-                self._text(oemconfig.get_oem_device_filter())
-            self.dot_profile['kiwi_oemtitle'] = \
-                self._text(oemconfig.get_oem_boot_title())
-            self.dot_profile['kiwi_oemkboot'] = \
-                self._text(oemconfig.get_oem_kiwi_initrd())
-            self.dot_profile['kiwi_oemnicfilter'] = \
-                self._text(oemconfig.get_oem_nic_filter())
-            self.dot_profile['kiwi_oemreboot'] = \
-                self._text(oemconfig.get_oem_reboot())
-            self.dot_profile['kiwi_oemrebootinteractive'] = \
-                self._text(oemconfig.get_oem_reboot_interactive())
-            self.dot_profile['kiwi_oemshutdown'] = \
-                self._text(oemconfig.get_oem_shutdown())
-            self.dot_profile['kiwi_oemshutdowninteractive'] = \
-                self._text(oemconfig.get_oem_shutdown_interactive())
-            self.dot_profile['kiwi_oemsilentboot'] = \
-                self._text(oemconfig.get_oem_silent_boot())
-            self.dot_profile['kiwi_oemsilentinstall'] = \
-                self._text(oemconfig.get_oem_silent_install())
-            self.dot_profile['kiwi_oemsilentverify'] = \
-                self._text(oemconfig.get_oem_silent_verify())
-            self.dot_profile['kiwi_oemskipverify'] = \
-                self._text(oemconfig.get_oem_skip_verify())
-            self.dot_profile['kiwi_oembootwait'] = \
-                self._text(oemconfig.get_oem_bootwait())
-            self.dot_profile['kiwi_oemunattended'] = \
-                self._text(oemconfig.get_oem_unattended())
-            self.dot_profile['kiwi_oemunattended_id'] = \
-                self._text(oemconfig.get_oem_unattended_id())
-            self.dot_profile['kiwi_oemrecovery'] = \
-                self._text(oemconfig.get_oem_recovery())
-            self.dot_profile['kiwi_oemrecoveryID'] = \
-                self._text(oemconfig.get_oem_recoveryID())
-            self.dot_profile['kiwi_oemrecoveryPartSize'] = \
-                self._text(oemconfig.get_oem_recovery_part_size())
-            self.dot_profile['kiwi_oemrecoveryInPlace'] = \
-                self._text(oemconfig.get_oem_inplace_recovery())
+            for key, getter in oemconfig_profile_map:
+                self.dot_profile[key] = \
+                    _text(getattr(oemconfig, getter)())
 
     def _drivers_to_profile(self):
         # kiwi_drivers
-        self.dot_profile['kiwi_drivers'] = ','.join(
-            self.xml_state.get_drivers_list()
-        )
+        drivers = self.xml_state.get_drivers_list()
+        if drivers:
+            self.dot_profile['kiwi_drivers'] = ','.join(drivers)
 
     def _type_complex_to_profile(self):
         # kiwi_xendomain
@@ -180,15 +218,15 @@ class Profile:
         # kiwi_strip_delete
         # kiwi_strip_tools
         # kiwi_strip_libs
-        self.dot_profile['kiwi_strip_delete'] = ' '.join(
-            self.xml_state.get_strip_files_to_delete()
-        )
-        self.dot_profile['kiwi_strip_tools'] = ' '.join(
-            self.xml_state.get_strip_tools_to_keep()
-        )
-        self.dot_profile['kiwi_strip_libs'] = ' '.join(
-            self.xml_state.get_strip_libraries_to_keep()
-        )
+        strip_delete = self.xml_state.get_strip_files_to_delete()
+        if strip_delete:
+            self.dot_profile['kiwi_strip_delete'] = ' '.join(strip_delete)
+        strip_tools = self.xml_state.get_strip_tools_to_keep()
+        if strip_tools:
+            self.dot_profile['kiwi_strip_tools'] = ' '.join(strip_tools)
+        strip_libs = self.xml_state.get_strip_libraries_to_keep()
+        if strip_libs:
+            self.dot_profile['kiwi_strip_libs'] = ' '.join(strip_libs)
 
     def _systemdisk_to_profile(self):
         # kiwi_lvmgroup
@@ -225,27 +263,10 @@ class Profile:
         # kiwi_splash_theme
         # kiwi_loader_theme
         for preferences in self.xml_state.get_preferences_sections():
-            if 'kiwi_iversion' not in self.dot_profile:
-                self.dot_profile['kiwi_iversion'] = \
-                    self._text(preferences.get_version())
-            if 'kiwi_showlicense' not in self.dot_profile:
-                self.dot_profile['kiwi_showlicense'] = \
-                    self._text(preferences.get_showlicense())
-            if 'kiwi_keytable' not in self.dot_profile:
-                self.dot_profile['kiwi_keytable'] = \
-                    self._text(preferences.get_keytable())
-            if 'kiwi_timezone' not in self.dot_profile:
-                self.dot_profile['kiwi_timezone'] = \
-                    self._text(preferences.get_timezone())
-            if 'kiwi_language' not in self.dot_profile:
-                self.dot_profile['kiwi_language'] = \
-                    self._text(preferences.get_locale())
-            if 'kiwi_splash_theme' not in self.dot_profile:
-                self.dot_profile['kiwi_splash_theme'] = \
-                    self._text(preferences.get_bootsplash_theme())
-            if 'kiwi_loader_theme' not in self.dot_profile:
-                self.dot_profile['kiwi_loader_theme'] = \
-                    self._text(preferences.get_bootloader_theme())
+            for key, getter in preferences_profile_map:
+                if self.dot_profile.get(key) is None:
+                    self.dot_profile[key] = \
+                        _text(getattr(preferences, getter)())
 
     def _type_to_profile(self):
         # kiwi_type
@@ -272,64 +293,25 @@ class Profile:
         # kiwi_btrfs_root_is_snapshot
         # kiwi_startsector
         type_section = self.xml_state.build_type
-        self.dot_profile['kiwi_type'] = \
-            type_section.get_image()
-        self.dot_profile['kiwi_compressed'] = \
-            type_section.get_compressed()
-        self.dot_profile['kiwi_boot_timeout'] = \
-            type_section.get_boottimeout()
-        self.dot_profile['kiwi_wwid_wait_timeout'] = \
-            type_section.get_wwid_wait_timeout()
-        self.dot_profile['kiwi_hybridpersistent'] = \
-            type_section.get_hybridpersistent()
-        self.dot_profile['kiwi_hybridpersistent_filesystem'] = \
-            type_section.get_hybridpersistent_filesystem()
+        for key, getter in type_profile_map:
+            self.dot_profile[key] = getattr(type_section, getter)()
         self.dot_profile['kiwi_initrd_system'] = \
             self.xml_state.get_initrd_system()
-        self.dot_profile['kiwi_ramonly'] = \
-            type_section.get_ramonly()
-        self.dot_profile['kiwi_target_blocksize'] = \
-            type_section.get_target_blocksize()
-        self.dot_profile['kiwi_target_removable'] = \
-            type_section.get_target_removable()
-        self.dot_profile['kiwi_cmdline'] = \
-            type_section.get_kernelcmdline()
-        self.dot_profile['kiwi_firmware'] = \
-            type_section.get_firmware()
-        self.dot_profile['kiwi_bootloader'] = \
-            type_section.get_bootloader()
-        self.dot_profile['kiwi_bootloader_console'] = \
-            type_section.get_bootloader_console()
-        self.dot_profile['kiwi_btrfs_root_is_snapshot'] = \
-            type_section.get_btrfs_root_is_snapshot()
-        self.dot_profile['kiwi_gpt_hybrid_mbr'] = \
-            type_section.get_gpt_hybrid_mbr()
-        self.dot_profile['kiwi_devicepersistency'] = \
-            type_section.get_devicepersistency()
-        self.dot_profile['kiwi_installboot'] = \
-            type_section.get_installboot()
-        self.dot_profile['kiwi_bootkernel'] = \
-            type_section.get_bootkernel()
-        self.dot_profile['kiwi_fsmountoptions'] = \
-            type_section.get_fsmountoptions()
-        self.dot_profile['kiwi_bootprofile'] = \
-            type_section.get_bootprofile()
-        self.dot_profile['kiwi_vga'] = \
-            type_section.get_vga()
         self.dot_profile['kiwi_startsector'] = \
             self.xml_state.get_disk_start_sector()
 
     def _profile_names_to_profile(self):
         # kiwi_profiles
-        self.dot_profile['kiwi_profiles'] = ','.join(
-            self.xml_state.profiles
-        )
+        if self.xml_state.profiles:
+            self.dot_profile['kiwi_profiles'] = ','.join(
+                self.xml_state.profiles
+            )
 
     def _packages_marked_for_deletion_to_profile(self):
         # kiwi_delete
-        self.dot_profile['kiwi_delete'] = ' '.join(
-            self.xml_state.get_to_become_deleted_packages()
-        )
+        delete_packages = self.xml_state.get_to_become_deleted_packages()
+        if delete_packages:
+            self.dot_profile['kiwi_delete'] = ' '.join(delete_packages)
 
     def _image_names_to_profile(self):
         # kiwi_displayname
@@ -346,26 +328,3 @@ class Profile:
 
         if self.xml_state.get_build_type_name() == 'cpio':
             self.dot_profile['kiwi_cpio_name'] = self.dot_profile['kiwi_iname']
-
-    def _text(self, section_content):
-        """
-        Helper method to return the text for XML elements of the
-        following structure: <section>text</section>. The data
-        structure builder will return the text as a list
-        """
-        if section_content:
-            content = section_content[0]
-            if content is True:
-                return 'true'
-            else:
-                return content
-
-    def _format(self, value):
-        """
-        Helper method to format bool profile values in the way
-        the boot code expects them
-        """
-        if value is True:
-            return 'true'
-        else:
-            return format(value)
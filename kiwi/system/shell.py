@@ -65,6 +65,25 @@ class Shell:
         with open(temp_copy.name) as quoted:
             return quoted.read().splitlines()
 
+    @staticmethod
+    def quote_key_value_string(data):
+        """
+        Quote given key=value formatted string data to be able to
+        become sourced by the shell
+
+        :param str data: key=value lines
+
+        :return: quoted text
+
+        :rtype: str
+        """
+        with NamedTemporaryFile('w') as temp_copy:
+            temp_copy.write(data)
+            temp_copy.flush()
+            Shell.run_common_function('baseQuoteFile', [temp_copy.name])
+            with open(temp_copy.name) as quoted:
+                return quoted.read().splitlines()
+
     @staticmethod
     def run_common_function(name, parameters):
         """
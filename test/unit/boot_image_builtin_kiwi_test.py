@@ -1,7 +1,7 @@
-import mock
+from unittest import mock
 
-from mock import patch
-from mock import call
+from unittest.mock import patch
+from unittest.mock import call
 from collections import namedtuple
 
 import kiwi
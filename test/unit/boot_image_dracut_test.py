@@ -1,7 +1,7 @@
-import mock
+from unittest import mock
 
-from mock import patch
-from mock import call
+from unittest.mock import patch
+from unittest.mock import call
 from collections import namedtuple
 
 from .test_helper import patch_open, raises
@@ -14,9 +14,13 @@ from kiwi.exceptions import KiwiDiskBootImageError
 
 
 class TestBootImageKiwi:
+    @patch('kiwi.boot.image.dracut.RuntimeConfig')
     @patch('kiwi.boot.image.base.os.path.exists')
     @patch('platform.machine')
-    def setup(self, mock_machine, mock_exists):
+    def setup(self, mock_machine, mock_exists, mock_RuntimeConfig):
+        runtime_config = mock.Mock()
+        runtime_config.get_initrd_compression.return_value = 'xz'
+        mock_RuntimeConfig.return_value = runtime_config
         self.context_manager_mock = mock.Mock()
         self.file_mock = mock.Mock()
         self.enter_mock = mock.Mock()
@@ -34,6 +38,7 @@ class TestBootImageKiwi:
         self.boot_image = BootImageDracut(
             self.xml_state, 'some-target-dir', 'system-directory'
         )
+        BootImageDracut._outfile_format_cache.clear()
 
     @patch('kiwi.boot.image.dracut.SystemSetup')
     @patch('kiwi.boot.image.dracut.Profile')
@@ -43,7 +48,9 @@ class TestBootImageKiwi:
         profile.dot_profile = dict()
         mock_profile.return_value = profile
         mock_setup.return_value = setup
+        self.boot_image.kernel_details = mock.Mock()
         self.boot_image.prepare()
+        assert self.boot_image.kernel_details is None
         setup.import_shell_environment.assert_called_once_with(profile)
         setup.setup_machine_id.assert_called_once_with()
         assert self.boot_image.dracut_options == [
@@ -110,12 +117,16 @@ class TestBootImageKiwi:
             '--install', 'foo'
         ]
 
+    @patch('kiwi.boot.image.dracut.CommandCapabilities.has_option_in_help')
+    @patch('kiwi.boot.image.dracut.shutil.move')
     @patch('kiwi.boot.image.dracut.Kernel')
     @patch('kiwi.boot.image.dracut.Command.run')
     @patch('kiwi.boot.image.base.BootImageBase.is_prepared')
     def test_create_initrd(
-        self, mock_prepared, mock_command, mock_kernel
+        self, mock_prepared, mock_command, mock_kernel, mock_move,
+        mock_has_option_in_help
     ):
+        mock_has_option_in_help.return_value = True
         kernel = mock.Mock()
         kernel_details = mock.Mock()
         kernel_details.version = '1.2.3'
@@ -126,40 +137,176 @@ class TestBootImageKiwi:
             '/system-directory/var/lib/bar', install_media=True
         )
         self.boot_image.include_module('foo')
+        self.boot_image.include_module('baz')
         self.boot_image.omit_module('bar')
+        self.boot_image.include_module('foo-install', install_media=True)
+        self.boot_image.omit_module('bar-install', install_media=True)
         self.boot_image.create_initrd()
         assert mock_command.call_args_list == [
             call([
                 'chroot', 'system-directory',
                 'dracut', '--force', '--no-hostonly',
-                '--no-hostonly-cmdline', '--xz',
-                '--add', ' foo ', '--omit', ' bar ',
+                '--no-hostonly-cmdline', '--compress',
+                'xz --check=crc32 --lzma2=dict=1MiB --threads=0',
+                '--add', 'foo', '--add', 'baz', '--omit', 'bar',
                 '--install', 'system-directory/etc/foo',
                 '--install', '/system-directory/var/lib/bar',
                 'LimeJeOS-openSUSE-13.2.x86_64-1.13.2.initrd.xz', '1.2.3'
-            ], stderr_to_stdout=True),
-            call([
-                'mv',
-                'system-directory/LimeJeOS-openSUSE-13.2.x86_64-1.13.2.initrd.xz',
-                'some-target-dir'
-            ])
+            ], stderr_to_stdout=True)
         ]
+        mock_move.assert_called_once_with(
+            'system-directory/LimeJeOS-openSUSE-13.2.x86_64-1.13.2.initrd.xz',
+            'some-target-dir/LimeJeOS-openSUSE-13.2.x86_64-1.13.2.initrd.xz'
+        )
         mock_command.reset_mock()
+        mock_move.reset_mock()
         self.boot_image.create_initrd(basename='foo', install_initrd=True)
         assert mock_command.call_args_list == [
             call([
                 'chroot', 'system-directory',
                 'dracut', '--force', '--no-hostonly',
-                '--no-hostonly-cmdline', '--xz',
+                '--no-hostonly-cmdline', '--compress',
+                'xz --check=crc32 --lzma2=dict=1MiB --threads=0',
+                '--add', 'foo-install', '--omit', 'bar-install',
                 '--install', '/system-directory/var/lib/bar',
                 'foo.xz', '1.2.3'
+            ], stderr_to_stdout=True)
+        ]
+        mock_move.assert_called_once_with(
+            'system-directory/foo.xz',
+            'some-target-dir/foo.xz'
+        )
+        mock_has_option_in_help.assert_called_once_with(
+            'xz', '--threads', root='system-directory', raise_on_error=False
+        )
+        mock_kernel.assert_called_once_with('system-directory')
+
+    @patch('kiwi.boot.image.dracut.os.remove')
+    @patch('kiwi.boot.image.dracut.CommandCapabilities.has_option_in_help')
+    @patch('kiwi.boot.image.dracut.shutil.move')
+    @patch('kiwi.boot.image.dracut.Kernel')
+    @patch('kiwi.boot.image.dracut.Command.run')
+    @patch('kiwi.boot.image.base.BootImageBase.is_prepared')
+    def test_create_initrd_xz_on_host(
+        self, mock_prepared, mock_command, mock_kernel, mock_move,
+        mock_has_option_in_help, mock_os_remove
+    ):
+        mock_has_option_in_help.return_value = False
+        kernel = mock.Mock()
+        kernel_details = mock.Mock()
+        kernel_details.version = '1.2.3'
+        kernel.get_kernel = mock.Mock(return_value=kernel_details)
+        mock_kernel.return_value = kernel
+        self.boot_image.create_initrd(basename='foo')
+        assert mock_command.call_args_list == [
+            call([
+                'chroot', 'system-directory',
+                'dracut', '--force', '--no-hostonly',
+                '--no-hostonly-cmdline', '--no-compress',
+                'foo', '1.2.3'
             ], stderr_to_stdout=True),
             call([
-                'mv',
-                'system-directory/foo.xz',
-                'some-target-dir'
+                'bash', '-c',
+                'xz --check=crc32 --lzma2=dict=1MiB --threads=0 --stdout '
+                'system-directory/foo > some-target-dir/foo.xz'
             ])
         ]
+        mock_os_remove.assert_called_once_with('system-directory/foo')
+        assert not mock_move.called
+        assert self.boot_image.initrd_filename == 'some-target-dir/foo.xz'
+
+    @patch('kiwi.boot.image.dracut.CommandCapabilities.has_option_in_help')
+    @patch('kiwi.boot.image.dracut.shutil.move')
+    @patch('kiwi.boot.image.dracut.Kernel')
+    @patch('kiwi.boot.image.dracut.Command.run')
+    @patch('kiwi.boot.image.base.BootImageBase.is_prepared')
+    def test_create_initrd_zstd(
+        self, mock_prepared, mock_command, mock_kernel, mock_move,
+        mock_has_option_in_help
+    ):
+        mock_has_option_in_help.return_value = True
+        kernel = mock.Mock()
+        kernel_details = mock.Mock()
+        kernel_details.version = '1.2.3'
+        kernel.get_kernel = mock.Mock(return_value=kernel_details)
+        mock_kernel.return_value = kernel
+        self.boot_image.compression = 'zstd'
+        self.boot_image.create_initrd(basename='foo')
+        assert mock_command.call_args_list == [
+            call([
+                'chroot', 'system-directory',
+                'dracut', '--force', '--no-hostonly',
+                '--no-hostonly-cmdline', '--zstd',
+                'foo.zst', '1.2.3'
+            ], stderr_to_stdout=True)
+        ]
+        mock_move.assert_called_once_with(
+            'system-directory/foo.zst',
+            'some-target-dir/foo.zst'
+        )
+        assert self.boot_image.initrd_filename == 'some-target-dir/foo.zst'
+        mock_command.reset_mock()
+        self.boot_image.create_initrd(basename='foo', install_initrd=True)
+        assert mock_command.call_args_list == [
+            call([
+                'chroot', 'system-directory',
+                'dracut', '--force', '--no-hostonly',
+                '--no-hostonly-cmdline', '--compress',
+                'xz --check=crc32 --lzma2=dict=1MiB --threads=0',
+                'foo.xz', '1.2.3'
+            ], stderr_to_stdout=True)
+        ]
+        assert self.boot_image.initrd_filename == 'some-target-dir/foo.xz'
+
+    @patch('kiwi.boot.image.dracut.BootImageDracut._has_reflink_support')
+    @patch('kiwi.boot.image.dracut.shutil.move')
+    @patch('kiwi.boot.image.dracut.Kernel')
+    @patch('kiwi.boot.image.dracut.Command.run')
+    @patch('kiwi.boot.image.base.BootImageBase.is_prepared')
+    def test_create_initrd_reflink(
+        self, mock_prepared, mock_command, mock_kernel, mock_move,
+        mock_has_reflink_support
+    ):
+        mock_has_reflink_support.return_value = True
+        kernel = mock.Mock()
+        kernel_details = mock.Mock()
+        kernel_details.version = '1.2.3'
+        kernel.get_kernel = mock.Mock(return_value=kernel_details)
+        mock_kernel.return_value = kernel
+        self.boot_image.compression = 'reflink'
+        self.boot_image.create_initrd(basename='foo')
+        assert mock_command.call_args_list == [
+            call([
+                'chroot', 'system-directory',
+                'dracut', '--force', '--no-hostonly',
+                '--no-hostonly-cmdline', '--enhanced-cpio', '--no-compress',
+                'foo', '1.2.3'
+            ], stderr_to_stdout=True)
+        ]
+        mock_move.assert_called_once_with(
+            'system-directory/foo',
+            'some-target-dir/foo'
+        )
+        assert self.boot_image.initrd_filename == 'some-target-dir/foo'
+
+    @patch('kiwi.boot.image.dracut.Command.run')
+    @patch('kiwi.boot.image.dracut.log.warning')
+    def test_has_reflink_support(self, mock_warning, mock_command):
+        command = mock.Mock()
+        command.output = 'btrfs\n'
+        mock_command.return_value = command
+        assert self.boot_image._has_reflink_support() is True
+        mock_command.assert_called_once_with(
+            [
+                'stat', '--file-system', '--format', '%T',
+                'system-directory'
+            ], raise_on_error=False
+        )
+        command.output = 'ext2/ext3\n'
+        assert self.boot_image._has_reflink_support() is False
+        assert mock_warning.called
+        command.output = None
+        assert self.boot_image._has_reflink_support() is False
 
     @raises(KiwiDiskBootImageError)
     @patch('kiwi.boot.image.dracut.Kernel')
@@ -170,12 +317,16 @@ class TestBootImageKiwi:
         self.boot_image.get_boot_names()
 
     @patch_open
+    @patch('kiwi.boot.image.dracut.os.fstat')
+    @patch('kiwi.boot.image.dracut.mmap.mmap')
     @patch('kiwi.boot.image.dracut.Kernel')
     @patch('kiwi.boot.image.dracut.Path.which')
     @patch('kiwi.boot.image.dracut.log.warning')
     def test_get_boot_names(
-        self, mock_warning, mock_Path_which, mock_Kernel, mock_open
+        self, mock_warning, mock_Path_which, mock_Kernel, mock_mmap,
+        mock_fstat, mock_open
     ):
+        mock_fstat.return_value.st_size = 42
         boot_names_type = namedtuple(
             'boot_names_type', ['kernel_name', 'initrd_name']
         )
@@ -187,18 +338,167 @@ class TestBootImageKiwi:
         kernel.get_kernel.return_value = kernel_info
         mock_Kernel.return_value = kernel
 
-        self.file_mock.read.return_value = 'outfile="/boot/initrd-$kernel"'
+        mock_mmap.return_value.__enter__.return_value = b'outfile="foo"'
+
+        assert self.boot_image.get_boot_names() == boot_names_type(
+            kernel_name='kernel_name',
+            initrd_name='initramfs-kernel_version.img'
+        )
+        mock_open.assert_called_once_with('dracut', 'rb')
+
+        mock_mmap.return_value.__enter__.return_value = \
+            b'outfile="/boot/initrd-$kernel"'
+
+        assert self.boot_image.get_boot_names() == boot_names_type(
+            kernel_name='kernel_name',
+            initrd_name='initrd-kernel_version'
+        )
 
-        mock_open.return_value = self.context_manager_mock
+        mock_open.reset_mock()
+        mock_mmap.return_value.__enter__.return_value = b'outfile="foo"'
 
         assert self.boot_image.get_boot_names() == boot_names_type(
             kernel_name='kernel_name',
             initrd_name='initrd-kernel_version'
         )
+        assert not mock_open.called
+
+    @patch_open
+    @patch('kiwi.boot.image.dracut.os.fstat')
+    @patch('kiwi.boot.image.dracut.mmap.mmap')
+    @patch('kiwi.boot.image.dracut.Kernel')
+    @patch('kiwi.boot.image.dracut.Path.which')
+    @patch('kiwi.boot.image.dracut.log.warning')
+    def test_get_boot_names_empty_dracut_script(
+        self, mock_warning, mock_Path_which, mock_Kernel, mock_mmap,
+        mock_fstat, mock_open
+    ):
+        mock_fstat.return_value.st_size = 0
+        mock_Path_which.return_value = 'dracut'
+        kernel = mock.Mock()
+        kernel_info = mock.Mock()
+        kernel_info.name = 'kernel_name'
+        kernel_info.version = 'kernel_version'
+        kernel.get_kernel.return_value = kernel_info
+        mock_Kernel.return_value = kernel
+
+        assert self.boot_image.get_boot_names().initrd_name == \
+            'initramfs-kernel_version.img'
+        assert not mock_mmap.called
 
-        self.file_mock.read.return_value = 'outfile="foo"'
+    @patch('kiwi.boot.image.dracut.SysConfig')
+    @patch('kiwi.boot.image.dracut.os.path.exists')
+    @patch('kiwi.boot.image.dracut.Path.which')
+    @patch('kiwi.boot.image.dracut.Kernel')
+    def test_get_boot_names_from_os_release(
+        self, mock_Kernel, mock_Path_which, mock_exists, mock_SysConfig
+    ):
+        boot_names_type = namedtuple(
+            'boot_names_type', ['kernel_name', 'initrd_name']
+        )
+        kernel = mock.Mock()
+        kernel_info = mock.Mock()
+        kernel_info.name = 'kernel_name'
+        kernel_info.version = 'kernel_version'
+        kernel.get_kernel.return_value = kernel_info
+        mock_Kernel.return_value = kernel
+        mock_exists.return_value = True
+        os_release = {
+            'ID': '"fedora"',
+            'ID_LIKE': '"suse"'
+        }
+        mock_SysConfig.return_value.get.side_effect = os_release.get
 
         assert self.boot_image.get_boot_names() == boot_names_type(
             kernel_name='kernel_name',
             initrd_name='initramfs-kernel_version.img'
         )
+        mock_SysConfig.assert_called_once_with(
+            'system-directory/etc/os-release'
+        )
+        assert not mock_Path_which.called
+
+    @patch_open
+    @patch('kiwi.boot.image.dracut.os.fstat')
+    @patch('kiwi.boot.image.dracut.mmap.mmap')
+    @patch('kiwi.boot.image.dracut.SysConfig')
+    @patch('kiwi.boot.image.dracut.os.path.exists')
+    @patch('kiwi.boot.image.dracut.Path.which')
+    @patch('kiwi.boot.image.dracut.Kernel')
+    def test_get_boot_names_dracut_script_before_os_release_id_like(
+        self, mock_Kernel, mock_Path_which, mock_exists, mock_SysConfig,
+        mock_mmap, mock_fstat, mock_open
+    ):
+        kernel = mock.Mock()
+        kernel_info = mock.Mock()
+        kernel_info.name = 'kernel_name'
+        kernel_info.version = 'kernel_version'
+        kernel.get_kernel.return_value = kernel_info
+        mock_Kernel.return_value = kernel
+        mock_exists.return_value = True
+        mock_fstat.return_value.st_size = 42
+        mock_Path_which.return_value = 'dracut'
+        mock_mmap.return_value.__enter__.return_value = \
+            b'outfile="/boot/initrd-$kernel.img"'
+        os_release = {
+            'ID': 'mageia',
+            'ID_LIKE': '"mandriva fedora"'
+        }
+        mock_SysConfig.return_value.get.side_effect = os_release.get
+
+        assert self.boot_image.get_boot_names().initrd_name == \
+            'initrd-kernel_version.img'
+
+    @patch('kiwi.boot.image.dracut.SysConfig')
+    @patch('kiwi.boot.image.dracut.os.path.exists')
+    @patch('kiwi.boot.image.dracut.Path.which')
+    @patch('kiwi.boot.image.dracut.Kernel')
+    def test_get_boot_names_from_os_release_id_like(
+        self, mock_Kernel, mock_Path_which, mock_exists, mock_SysConfig
+    ):
+        kernel = mock.Mock()
+        kernel_info = mock.Mock()
+        kernel_info.name = 'kernel_name'
+        kernel_info.version = 'kernel_version'
+        kernel.get_kernel.return_value = kernel_info
+        mock_Kernel.return_value = kernel
+        mock_exists.return_value = True
+        mock_Path_which.return_value = None
+        os_release = {
+            'ID': '"opensuse-leap"',
+            'ID_LIKE': '"suse opensuse"'
+        }
+        mock_SysConfig.return_value.get.side_effect = os_release.get
+
+        assert self.boot_image.get_boot_names().initrd_name == \
+            'initrd-kernel_version'
+        assert mock_Path_which.called
+
+    @patch('kiwi.boot.image.dracut.SysConfig')
+    @patch('kiwi.boot.image.dracut.os.path.exists')
+    @patch('kiwi.boot.image.dracut.Path.which')
+    @patch('kiwi.boot.image.dracut.Kernel')
+    @patch('kiwi.boot.image.dracut.log.warning')
+    def test_get_boot_names_unknown_os_release(
+        self, mock_warning, mock_Kernel, mock_Path_which, mock_exists,
+        mock_SysConfig
+    ):
+        kernel = mock.Mock()
+        kernel_info = mock.Mock()
+        kernel_info.name = 'kernel_name'
+        kernel_info.version = 'kernel_version'
+        kernel.get_kernel.return_value = kernel_info
+        mock_Kernel.return_value = kernel
+        mock_exists.return_value = True
+        mock_Path_which.return_value = None
+        os_release = {
+            'ID': 'foo'
+        }
+        mock_SysConfig.return_value.get.side_effect = os_release.get
+
+        assert self.boot_image.get_boot_names().initrd_name == \
+            'initramfs-kernel_version.img'
+        mock_Path_which.assert_called_once_with(
+            'dracut', custom_env={'PATH': 'system-directory/usr/bin'},
+            access_mode=1
+        )
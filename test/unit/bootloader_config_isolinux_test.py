@@ -1,6 +1,6 @@
 import kiwi
-import mock
-from mock import (
+from unittest import mock
+from unittest.mock import (
     patch, call
 )
 from .test_helper import raises, patch_open
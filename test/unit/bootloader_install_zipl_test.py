@@ -1,7 +1,7 @@
-from mock import patch
-from mock import call
+from unittest.mock import patch
+from unittest.mock import call
 
-import mock
+from unittest import mock
 
 from .test_helper import raises
 
@@ -1,6 +1,6 @@
-from mock import patch
+from unittest.mock import patch
 
-import mock
+from unittest import mock
 import kiwi
 
 from .test_helper import raises
@@ -1,6 +1,6 @@
-import mock
-from mock import call
-from mock import patch
+from unittest import mock
+from unittest.mock import call
+from unittest.mock import patch
 
 import kiwi
 
@@ -1,6 +1,6 @@
 import sys
 
-from mock import patch
+from unittest.mock import patch
 
 from .test_helper import argv_kiwi_tests, raises
 
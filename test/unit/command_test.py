@@ -1,7 +1,7 @@
-from mock import patch
+from unittest.mock import patch
 from collections import namedtuple
 
-import mock
+from unittest import mock
 
 import os
 
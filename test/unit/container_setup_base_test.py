@@ -1,6 +1,6 @@
-from mock import patch
-from mock import call
-import mock
+from unittest.mock import patch
+from unittest.mock import call
+from unittest import mock
 
 from .test_helper import raises, patch_open
 
@@ -1,8 +1,8 @@
-from mock import patch
+from unittest.mock import patch
 
 import sys
 
-import mock
+from unittest import mock
 
 from .test_helper import argv_kiwi_tests
 
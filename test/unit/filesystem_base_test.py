@@ -1,7 +1,7 @@
 
-from mock import patch
+from unittest.mock import patch
 
-import mock
+from unittest import mock
 
 from .test_helper import raises
 
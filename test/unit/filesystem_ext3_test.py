@@ -1,6 +1,6 @@
-from mock import patch
+from unittest.mock import patch
 
-import mock
+from unittest import mock
 
 from kiwi.filesystem.ext3 import FileSystemExt3
 
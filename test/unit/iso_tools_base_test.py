@@ -1,4 +1,4 @@
-from mock import (
+from unittest.mock import (
     patch, Mock, call
 )
 from .test_helper import raises
@@ -1,5 +1,5 @@
-from mock import patch, call
-import mock
+from unittest.mock import patch, call
+from unittest import mock
 from collections import namedtuple
 from .test_helper import raises, patch_open
 
@@ -1,8 +1,8 @@
 from builtins import bytes
-from mock import (
+from unittest.mock import (
     call, patch
 )
-import mock
+from unittest import mock
 import struct
 import pytest
 import sys
@@ -1,4 +1,4 @@
-from mock import patch
+from unittest.mock import patch
 from .test_helper import raises
 
 from kiwi.iso_tools.xorriso import IsoToolsXorrIso
@@ -1,5 +1,5 @@
-from mock import patch
-from mock import call
+from unittest.mock import patch
+from unittest.mock import call
 from collections import namedtuple
 
 from .test_helper import raises
@@ -1,5 +1,5 @@
-import mock
-from mock import patch
+from unittest import mock
+from unittest.mock import patch
 
 from .test_helper import raises
 
@@ -1,6 +1,6 @@
-from mock import patch, call
+from unittest.mock import patch, call
 
-import mock
+from unittest import mock
 
 from .test_helper import patch_open
 
@@ -1,10 +1,10 @@
 
-from mock import patch
-from mock import call
+from unittest.mock import patch
+from unittest.mock import call
 
 from .test_helper import patch_open
 
-import mock
+from unittest import mock
 
 from kiwi.repository.dnf import RepositoryDnf
 
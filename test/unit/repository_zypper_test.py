@@ -1,8 +1,8 @@
 from pytest import raises
-from mock import patch
-from mock import call
+from unittest.mock import patch
+from unittest.mock import call
 
-import mock
+from unittest import mock
 import os
 
 from .test_helper import patch_open
@@ -1,6 +1,6 @@
 import sys
-from mock import patch
-import mock
+from unittest.mock import patch
+from unittest import mock
 from pytest import raises
 
 from kiwi.xml_state import XMLState
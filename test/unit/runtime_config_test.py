@@ -1,4 +1,4 @@
-from mock import patch
+from unittest.mock import patch
 
 from .test_helper import (
     raises, patch_open
@@ -84,6 +84,23 @@ class TestRuntimeConfig:
         mock_get_attribute.return_value = 'xz'
         assert self.runtime_config.get_container_compression() == 'xz'
 
+    def test_get_initrd_compression(self):
+        assert self.runtime_config.get_initrd_compression() == 'zstd'
+
+    def test_get_initrd_compression_default(self):
+        assert self.default_runtime_config.get_initrd_compression() == 'xz'
+
+    @patch.object(RuntimeConfig, '_get_attribute')
+    @patch('kiwi.logger.log.warning')
+    def test_get_initrd_compression_invalid(
+        self, mock_warning, mock_get_attribute
+    ):
+        mock_get_attribute.return_value = 'foo'
+        assert self.runtime_config.get_initrd_compression() == 'xz'
+        mock_warning.assert_called_once_with(
+            'Skipping invalid initrd compression: foo'
+        )
+
     def test_get_iso_tool_category(self):
         assert self.runtime_config.get_iso_tool_category() == 'cdrtools'
 
@@ -1,4 +1,4 @@
-from mock import patch
+from unittest.mock import patch
 
 from kiwi.system.shell import Shell
 
@@ -19,6 +19,16 @@ class TestShell:
             "strange='$a_foo'"
         ]
 
+    def test_quote_key_value_string(self):
+        assert Shell.quote_key_value_string(
+            'foo=\'bar\'\nbar="xxx"\nname=bob\nstrange="$a_foo"\n'
+        ) == [
+            "foo='bar'",
+            "bar='xxx'",
+            "name='bob'",
+            "strange='$a_foo'"
+        ]
+
     @patch('kiwi.system.shell.Command.run')
     def test_run_common_function(self, mock_command):
         Shell.run_common_function('foo', ['"param1"', '"param2"'])
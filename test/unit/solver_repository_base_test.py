@@ -1,6 +1,6 @@
-from mock import patch, call
+from unittest.mock import patch, call
 import os
-import mock
+from unittest import mock
 
 from lxml import etree
 
@@ -1,5 +1,5 @@
-from mock import patch
-import mock
+from unittest.mock import patch
+from unittest import mock
 
 from .test_helper import raises
 
@@ -1,5 +1,5 @@
 import io
-from mock import (
+from unittest.mock import (
     patch, call, MagicMock, Mock
 )
 from pytest import raises
@@ -1,6 +1,6 @@
 import io
 from textwrap import dedent
-from mock import (
+from unittest.mock import (
     patch, Mock, MagicMock, call
 )
 
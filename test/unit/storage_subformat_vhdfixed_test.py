@@ -1,9 +1,9 @@
 import sys
 
-from mock import call
-from mock import patch
+from unittest.mock import call
+from unittest.mock import patch
 
-import mock
+from unittest import mock
 
 from .test_helper import raises, patch_open
 
@@ -1,8 +1,8 @@
 from pytest import raises
-from mock import (
+from unittest.mock import (
     patch, call
 )
-import mock
+from unittest import mock
 
 from kiwi.exceptions import (
     KiwiBootStrapPhaseFailed,
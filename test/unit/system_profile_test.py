@@ -1,8 +1,5 @@
 # vim: set fileencoding=utf-8
-from mock import patch
-
-import mock
-import os
+from unittest.mock import patch
 
 from kiwi.system.profile import Profile
 from kiwi.xml_state import XMLState
@@ -11,20 +8,15 @@ from kiwi.xml_description import XMLDescription
 
 class TestProfile:
     def setup(self):
-        self.tmpfile = mock.Mock()
-        self.tmpfile.name = 'tmpfile'
         description = XMLDescription('../data/example_dot_profile_config.xml')
         self.profile = Profile(
             XMLState(description.load())
         )
 
-    @patch('kiwi.system.profile.NamedTemporaryFile')
     @patch('kiwi.path.Path.which')
-    def test_create(self, mock_which, mock_temp):
+    def test_create(self, mock_which):
         mock_which.return_value = 'cp'
-        mock_temp.return_value = self.tmpfile
         result = self.profile.create()
-        os.remove(self.tmpfile.name)
         assert self.profile.dot_profile == {
             'kiwi_Volume_1': 'usr_lib|size:1024|usr/lib',
             'kiwi_Volume_2': 'LVRoot|freespace:500|',
@@ -38,11 +30,9 @@ class TestProfile:
             'kiwi_boot_timeout': None,
             'kiwi_cmdline': 'splash',
             'kiwi_compressed': None,
-            'kiwi_delete': '',
             'kiwi_devicepersistency': None,
             'kiwi_bootloader_console': None,
             'kiwi_displayname': 'schäfer',
-            'kiwi_drivers': '',
             'kiwi_firmware': 'efi',
             'kiwi_fsmountoptions': None,
             'kiwi_hybridpersistent_filesystem': None,
@@ -80,7 +70,6 @@ class TestProfile:
             'kiwi_oemunattended_id': None,
             'kiwi_oemunattended': None,
             'kiwi_oemvmcp_parmfile': None,
-            'kiwi_profiles': '',
             'kiwi_ramonly': True,
             'kiwi_initrd_system': 'kiwi',
             'kiwi_install_volid': 'INSTALL',
@@ -88,9 +77,6 @@ class TestProfile:
             'kiwi_gpt_hybrid_mbr': None,
             'kiwi_showlicense': None,
             'kiwi_splash_theme': 'openSUSE',
-            'kiwi_strip_delete': '',
-            'kiwi_strip_libs': '',
-            'kiwi_strip_tools': '',
             'kiwi_target_blocksize': None,
             'kiwi_timezone': 'Europe/Berlin',
             'kiwi_type': 'oem',
@@ -129,32 +115,51 @@ class TestProfile:
             "kiwi_xendomain='dom0'"
         ]
 
-    @patch('kiwi.system.profile.NamedTemporaryFile')
     @patch('kiwi.path.Path.which')
-    def test_create_displayname_is_image_name(self, mock_which, mock_temp):
+    def test_create_displayname_is_image_name(self, mock_which):
         mock_which.return_value = 'cp'
-        mock_temp.return_value = self.tmpfile
         description = XMLDescription('../data/example_pxe_config.xml')
         profile = Profile(
             XMLState(description.load())
         )
         profile.create()
-        os.remove(self.tmpfile.name)
         assert profile.dot_profile['kiwi_displayname'] == 'LimeJeOS-openSUSE-13.2'
 
-    @patch('kiwi.system.profile.NamedTemporaryFile')
     @patch('kiwi.path.Path.which')
-    def test_create_cpio(self, mock_which, mock_temp):
+    def test_create_cpio(self, mock_which):
         mock_which.return_value = 'cp'
-        mock_temp.return_value = self.tmpfile
         description = XMLDescription('../data/example_dot_profile_config.xml')
         profile = Profile(
             XMLState(description.load(), None, 'cpio')
         )
         profile.create()
-        os.remove(self.tmpfile.name)
         assert profile.dot_profile['kiwi_cpio_name'] == 'LimeJeOS-openSUSE-13.2'
 
+    def test_lists_to_profile(self):
+        description = XMLDescription('../data/example_config.xml')
+        profile = Profile(
+            XMLState(description.load(), ['vmxFlavour'])
+        )
+        assert profile.dot_profile['kiwi_delete'] == 'kernel-debug'
+        assert profile.dot_profile['kiwi_drivers'] == \
+            'crypto/*,drivers/acpi/*,bar'
+        assert profile.dot_profile['kiwi_profiles'] == 'vmxFlavour'
+        assert profile.dot_profile['kiwi_strip_delete'] == 'del-a del-b'
+        assert profile.dot_profile['kiwi_strip_libs'] == 'lib-a lib-b'
+        assert profile.dot_profile['kiwi_strip_tools'] == 'tool-a tool-b'
+
+    def test_preferences_to_profile_from_first_section_setting_value(self):
+        # the first preferences section only sets the locale, the
+        # version, keytable and timezone are taken from the next one
+        description = XMLDescription('../data/example_config.xml')
+        profile = Profile(
+            XMLState(description.load())
+        )
+        assert profile.dot_profile['kiwi_language'] == 'en_US,de_DE'
+        assert profile.dot_profile['kiwi_iversion'] == '1.13.2'
+        assert profile.dot_profile['kiwi_keytable'] == 'us.map.gz'
+        assert profile.dot_profile['kiwi_timezone'] == 'Europe/Berlin'
+
     def test_add(self):
         self.profile.add('foo', 'bar')
         assert self.profile.dot_profile['foo'] == 'bar'
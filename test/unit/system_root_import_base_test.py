@@ -1,4 +1,4 @@
-from mock import patch, call
+from unittest.mock import patch, call
 
 from .test_helper import raises
 
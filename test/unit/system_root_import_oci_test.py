@@ -1,6 +1,6 @@
-import mock
-from mock import patch
-# from mock import call
+from unittest import mock
+from unittest.mock import patch
+# from unittest.mock import call
 
 from .test_helper import raises
 
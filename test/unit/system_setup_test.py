@@ -1,8 +1,8 @@
 
-from mock import patch
-from mock import call
+from unittest.mock import patch
+from unittest.mock import call
 
-import mock
+from unittest import mock
 
 from .test_helper import raises, patch_open
 from collections import namedtuple
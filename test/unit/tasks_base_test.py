@@ -1,4 +1,4 @@
-from mock import patch
+from unittest.mock import patch
 
 import logging
 from .test_helper import raises
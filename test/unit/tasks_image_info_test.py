@@ -1,7 +1,7 @@
 import sys
-import mock
+from unittest import mock
 
-from mock import patch, call
+from unittest.mock import patch, call
 
 import kiwi
 
@@ -1,6 +1,6 @@
 import sys
-import mock
-from mock import call
+from unittest import mock
+from unittest.mock import call
 import os
 
 import kiwi
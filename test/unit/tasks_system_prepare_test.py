@@ -1,8 +1,8 @@
 import sys
-import mock
+from unittest import mock
 import os
 
-from mock import patch, call
+from unittest.mock import patch, call
 
 import kiwi
 
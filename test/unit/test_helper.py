@@ -4,7 +4,7 @@ import kiwi.logger
 import sys
 import logging
 from io import BytesIO
-from mock import MagicMock, patch
+from unittest.mock import MagicMock, patch
 
 # default log level, overwrite when needed
 kiwi.logger.log.setLevel(logging.WARN)
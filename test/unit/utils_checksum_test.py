@@ -1,6 +1,6 @@
-from mock import call
-from mock import patch
-import mock
+from unittest.mock import call
+from unittest.mock import patch
+from unittest import mock
 
 from .test_helper import raises, patch_open
 
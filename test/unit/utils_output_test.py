@@ -1,7 +1,7 @@
-from mock import patch
+from unittest.mock import patch
 from kiwi.utils.output import DataOutput
 import json
-import mock
+from unittest import mock
 
 
 class TestDataOutput:
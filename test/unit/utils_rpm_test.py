@@ -1,7 +1,7 @@
 import io
 import os
 from .test_helper import patch_open
-from mock import (
+from unittest.mock import (
     patch, Mock, MagicMock, call
 )
 
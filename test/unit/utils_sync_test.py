@@ -1,6 +1,6 @@
 import os
 from stat import ST_MODE
-from mock import patch
+from unittest.mock import patch
 
 from kiwi.utils.sync import DataSync
 
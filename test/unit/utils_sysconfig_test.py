@@ -1,6 +1,6 @@
-from mock import call
+from unittest.mock import call
 
-import mock
+from unittest import mock
 
 from .test_helper import patch_open
 